@@ -19,11 +19,11 @@ CLAUDE.md Generator v2 — 交互式 CLAUDE.md 配置文件生成工具
       microservice, monorepo, k8s-operator, terraform
 """
 
+import functools
+import os
 import sys
-import textwrap
-from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 # ============================================================================
 # ANSI 颜色
@@ -33,45 +33,74 @@ class C:
     RED = "\033[31m"; GRN = "\033[32m"; YLW = "\033[33m"
     BLU = "\033[34m"; MAG = "\033[35m"; CYN = "\033[36m"
 
-def c(t, color): return f"{color}{t}{C.RST}"
-def hdr(t): return c(f"\n{'='*64}\n  {t}\n{'='*64}", C.CYN + C.B)
-def sub(t): return c(f"\n  ── {t} ──", C.YLW)
+# 交互/着色热路径使用的模块级别名，省去对类 C 的属性查找
+_RST, _B, _DIM, _RED, _GRN, _YLW, _CYN = C.RST, C.B, C.DIM, C.RED, C.GRN, C.YLW, C.CYN
+
+# 着色函数只依赖入参，提示文案大多是固定字面量，缓存后重复调用无需再拼接
+@functools.lru_cache(maxsize=2048)
+def c(t, color): return f"{color}{t}{_RST}"
+
+@functools.lru_cache(maxsize=2048)
+def hdr(t): return c(f"\n{'='*64}\n  {t}\n{'='*64}", _CYN + _B)
+
+@functools.lru_cache(maxsize=2048)
+def sub(t): return c(f"\n  ── {t} ──", _YLW)
 
 # ============================================================================
 # i18n — 中英文文案系统
 # ============================================================================
 # 全局语言标记：由 wizard 第一步或 CLI 参数 --en 设置
 _LANG = "zh"
+# L() 的取值下标：0 = 中文，1 = 英文，由 set_lang() 维护
+_L_INDEX = 0
 
 def set_lang(lang: str):
-    global _LANG
+    """切换语言，并重新绑定各语言相关的预计算文案"""
+    # 这些全局量的初始值由 _TECH_LABELS_ZH/_EN 定义之后的 set_lang(_LANG) 设置
+    global _LANG, _L_INDEX, _TITLES_ACTIVE, _TECH_LABELS_ACTIVE, _TYPE_LABEL, _STATUS_LABEL, _HARD_WARN, _VERIFY_INTRO
     _LANG = lang
+    _L_INDEX = 0 if lang == "zh" else 1
+    _TITLES_ACTIVE = (_TITLES_ZH, _TITLES_EN)[_L_INDEX]
+    _TECH_LABELS_ACTIVE = (_TECH_LABELS_ZH, _TECH_LABELS_EN)[_L_INDEX]
+    _TYPE_LABEL = L("类型", "Type")
+    _STATUS_LABEL = L("状态", "Status")
+    _HARD_WARN = L("重要：以下规则绝对不可违反。", "IMPORTANT: The following rules must NEVER be violated.")
+    _VERIFY_INTRO = L(
+        "完成任何修改后，必须按以下清单逐项验证：",
+        "After completing any change, verify each item below:"
+    )
 
 def L(zh: str, en: str) -> str:
     """根据当前语言返回对应文案"""
-    return zh if _LANG == "zh" else en
+    return (zh, en)[_L_INDEX]
 
 # ============================================================================
 # 交互辅助函数
 # ============================================================================
 def ask(prompt, default=""):
     if default:
-        raw = input(f"  {c(prompt, C.CYN)} [{c(default, C.DIM)}]: ").strip()
+        raw = input(f"  {c(prompt, _CYN)} [{c(default, _DIM)}]: ").strip()
         return raw if raw else default
-    return input(f"  {c(prompt, C.CYN)}: ").strip()
+    return input(f"  {c(prompt, _CYN)}: ").strip()
 
 def ask_yn(prompt, default=True):
     hint = "Y/n" if default else "y/N"
-    raw = input(f"  {c(prompt, C.CYN)} [{hint}]: ").strip().lower()
+    raw = input(f"  {c(prompt, _CYN)} [{hint}]: ").strip().lower()
     if not raw:
         return default
     return raw in ("y", "yes", "是")
 
+@functools.lru_cache(maxsize=64)
+def _render_menu(options: tuple, default=None) -> str:
+    """渲染选项菜单；同一组选项重复出现时直接复用"""
+    return "\n".join(
+        f"    {c(f'[{i}]', _YLW)} {label}{c(' (*)', _DIM) if default == key else ''}"
+        for i, (key, label) in enumerate(options, 1)
+    )
+
 def ask_multi(prompt, options, default=None):
-    print(f"\n  {c(prompt, C.CYN)}")
-    for i, (key, label) in enumerate(options, 1):
-        marker = c(" (*)", C.DIM) if default == key else ""
-        print(f"    {c(f'[{i}]', C.YLW)} {label}{marker}")
+    # 标题与全部选项拼成一次输出
+    print(f"\n  {c(prompt, _CYN)}\n{_render_menu(tuple(options), default)}")
     raw = input(f"  {L('选择序号', 'Choose')}: ").strip()
     if not raw and default:
         return default
@@ -81,58 +110,83 @@ def ask_multi(prompt, options, default=None):
     except (ValueError, IndexError):
         return default or options[0][0]
 
+def _read_lines():
+    """逐行读取输入直到空行。管道输入时直接读 stdin，不再逐行打印提示符"""
+    if sys.stdin.isatty():
+        while True:
+            line = input("    > ").strip()
+            if not line:
+                return
+            yield line
+    else:
+        for raw in iter(sys.stdin.readline, ""):
+            line = raw.strip()
+            if not line:
+                return
+            yield line
+
 def ask_lines(prompt):
-    print(f"  {c(prompt, C.CYN)} {c(L('(每行一条，空行结束)', '(one per line, empty to finish)'), C.DIM)}")
-    lines = []
-    while True:
-        line = input("    > ").strip()
-        if not line:
-            break
-        lines.append(line)
-    return lines
+    print(f"  {c(prompt, _CYN)} {c(L('(每行一条，空行结束)', '(one per line, empty to finish)'), _DIM)}")
+    return list(_read_lines())
 
 def ask_cmds(prompt):
     """输入命令对: label=command"""
-    print(f"  {c(prompt, C.CYN)} {c(L('(格式: 名称=命令，空行结束)', '(format: label=cmd, empty to finish)'), C.DIM)}")
-    print(f"  {c(L('例如: 运行测试=go test ./...', 'e.g.: Run tests=go test ./...'), C.DIM)}")
+    print(f"  {c(prompt, _CYN)} {c(L('(格式: 名称=命令，空行结束)', '(format: label=cmd, empty to finish)'), _DIM)}")
+    print(f"  {c(L('例如: 运行测试=go test ./...', 'e.g.: Run tests=go test ./...'), _DIM)}")
     cmds = {}
-    while True:
-        raw = input("    > ").strip()
-        if not raw:
-            break
+    for raw in _read_lines():
         if "=" in raw:
             k, v = raw.split("=", 1)
             cmds[k.strip()] = v.strip()
         else:
-            print(f"    {c(L('格式：名称=命令', 'Format: label=cmd'), C.RED)}")
+            print(f"    {c(L('格式：名称=命令', 'Format: label=cmd'), _RED)}")
     return cmds
 
 
 # ============================================================================
 # 章节标题 i18n 映射
 # ============================================================================
-def T(key: str) -> str:
-    """返回章节标题"""
-    _TITLES = {
-        "overview":    L("项目概述", "Project Overview"),
-        "role":        L("角色定义", "Role Definition"),
-        "tech":        L("技术栈与环境", "Tech Stack & Environment"),
-        "structure":   L("项目结构", "Project Structure"),
-        "commands":    L("常用命令", "Common Commands"),
-        "style":       L("代码规范", "Code Style"),
-        "core":        L("核心规范", "Core Rules"),
-        "workflow":    L("工作流程", "Workflow"),
-        "thinking":    L("思考策略", "Thinking Strategy"),
-        "testing":     L("测试规范", "Testing"),
-        "error":       L("错误处理", "Error Handling"),
-        "security":    L("安全规范", "Security"),
-        "git":         L("Git 规范", "Git Conventions"),
-        "hard":        L("禁止事项", "Hard Rules — NEVER Do"),
-        "gotchas":     L("特殊注意", "Gotchas & Warnings"),
-        "verify":      L("验证检查清单", "Verification Checklist"),
-        "references":  L("参考资源", "References"),
-    }
-    return _TITLES.get(key, key)
+# 两种语言的标题表在导入时构建一次，set_lang() 只切换引用
+# 渲染器通过 assemble() 注入的 cfg["_headers"] 读取标题
+_TITLES_ZH = {
+    "overview":   "项目概述",
+    "role":       "角色定义",
+    "tech":       "技术栈与环境",
+    "structure":  "项目结构",
+    "commands":   "常用命令",
+    "style":      "代码规范",
+    "core":       "核心规范",
+    "workflow":   "工作流程",
+    "thinking":   "思考策略",
+    "testing":    "测试规范",
+    "error":      "错误处理",
+    "security":   "安全规范",
+    "git":        "Git 规范",
+    "hard":       "禁止事项",
+    "gotchas":    "特殊注意",
+    "verify":     "验证检查清单",
+    "references": "参考资源",
+}
+
+_TITLES_EN = {
+    "overview":   "Project Overview",
+    "role":       "Role Definition",
+    "tech":       "Tech Stack & Environment",
+    "structure":  "Project Structure",
+    "commands":   "Common Commands",
+    "style":      "Code Style",
+    "core":       "Core Rules",
+    "workflow":   "Workflow",
+    "thinking":   "Thinking Strategy",
+    "testing":    "Testing",
+    "error":      "Error Handling",
+    "security":   "Security",
+    "git":        "Git Conventions",
+    "hard":       "Hard Rules — NEVER Do",
+    "gotchas":    "Gotchas & Warnings",
+    "verify":     "Verification Checklist",
+    "references": "References",
+}
 
 
 # ============================================================================
@@ -140,50 +194,40 @@ def T(key: str) -> str:
 # ============================================================================
 
 def _bullet(items: list, prefix: str = "-") -> str:
-    return "\n".join(f"{prefix} {x}" for x in items) if items else ""
+    return "".join(f"{prefix} {x}\n" for x in items) if items else ""
 
-def _numbered(items: list) -> str:
-    return "\n".join(f"{i}. {x}" for i, x in enumerate(items, 1)) if items else ""
 
+# 概述章节读取的字段及默认值
+_OVERVIEW_FIELDS = (
+    ("project_name",   "my-project"),
+    ("project_desc",   ""),
+    ("project_type",   ""),
+    ("project_status", ""),
+)
 
 def render_overview(cfg: dict) -> str:
-    name = cfg.get("project_name", "my-project")
-    desc = cfg.get("project_desc", "")
-    ptype = cfg.get("project_type", "")
-    status = cfg.get("project_status", "")
-    lines = [f"# {name}", ""]
-    lines.append(f"## {T('overview')}")
-    lines.append("")
-    if desc:
-        lines.append(desc)
-        lines.append("")
-    if ptype:
-        lines.append(f"- **{L('类型','Type')}**: {ptype}")
-    if status:
-        lines.append(f"- **{L('状态','Status')}**: {status}")
-    lines.append("")
-    return "\n".join(lines)
-
-
-def render_role(cfg: dict) -> str:
+    name, desc, ptype, status = (cfg.get(k, d) for k, d in _OVERVIEW_FIELDS)
+    desc_block = f"{desc}\n\n" if desc else ""
+    type_line = f"- **{_TYPE_LABEL}**: {ptype}\n" if ptype else ""
+    status_line = f"- **{_STATUS_LABEL}**: {status}\n" if status else ""
+    return f"# {name}\n\n## {cfg['_headers']['overview']}\n\n{desc_block}{type_line}{status_line}"
+
+
+def render_role(cfg: dict) -> Optional[str]:
     role = cfg.get("role", "")
     extras = cfg.get("persona_extras", [])
     if not role:
-        return ""
-    lines = [f"## {T('role')}", ""]
-    lines.append(f"You are a {role}.")
-    lines.append("")
-    if extras:
-        lines.append(_bullet(extras))
-        lines.append("")
-    return "\n".join(lines)
+        return None
+    extras_block = f"\n{_bullet(extras)}" if extras else ""
+    return f"## {cfg['_headers']['role']}\n\nYou are a {role}.\n{extras_block}"
 
 
-def render_tech(cfg: dict) -> str:
+def render_tech(cfg: dict) -> Optional[str]:
     """根据 tech_items 列表渲染技术栈，不再硬编码 language/framework/db 字段"""
-    items = cfg.get("tech_items", [])
+    items = cfg.get("tech_items", ())
     # 兼容旧格式
     if not items:
+        items = []
         for key, label_zh, label_en in [
             ("language",       "语言",   "Language"),
             ("framework",      "框架",   "Framework"),
@@ -196,136 +240,107 @@ def render_tech(cfg: dict) -> str:
                 items.append(f"**{L(label_zh, label_en)}**: {val}")
         items.extend(cfg.get("tech_extras", []))
     if not items:
-        return ""
-    lines = [f"## {T('tech')}", ""]
-    lines.append(_bullet(items))
-    lines.append("")
-    return "\n".join(lines)
+        return None
+    return f"## {cfg['_headers']['tech']}\n\n{_bullet(items)}"
 
 
-def render_structure(cfg: dict) -> str:
+def render_structure(cfg: dict) -> Optional[str]:
     s = cfg.get("project_structure", "")
-    if not s:
-        return ""
-    lines = [f"## {T('structure')}", "", "```", s, "```", ""]
-    return "\n".join(lines)
+    return f"## {cfg['_headers']['structure']}\n\n```\n{s}\n```\n" if s else None
 
 
-def render_commands(cfg: dict) -> str:
+def render_commands(cfg: dict) -> Optional[str]:
     cmds = cfg.get("commands", {})
     if not cmds:
-        return ""
-    lines = [f"## {T('commands')}", ""]
-    for label, cmd in cmds.items():
-        lines.append(f"- **{label}**: `{cmd}`")
-    lines.append("")
-    return "\n".join(lines)
+        return None
+    body = "".join(f"- **{label}**: `{cmd}`\n" for label, cmd in cmds.items())
+    return f"## {cfg['_headers']['commands']}\n\n{body}"
 
 
-def render_style(cfg: dict) -> str:
+def render_style(cfg: dict) -> Optional[str]:
     items = cfg.get("code_style_rules", [])
     if not items:
-        return ""
-    return f"## {T('style')}\n\n{_bullet(items)}\n"
+        return None
+    return f"## {cfg['_headers']['style']}\n\n{_bullet(items)}"
 
 
-def render_core(cfg: dict) -> str:
+def render_core(cfg: dict) -> Optional[str]:
     items = cfg.get("core_rules", [])
     if not items:
-        return ""
-    return f"## {T('core')}\n\n{_bullet(items)}\n"
+        return None
+    return f"## {cfg['_headers']['core']}\n\n{_bullet(items)}"
 
 
-def render_workflow(cfg: dict) -> str:
+def render_workflow(cfg: dict) -> Optional[str]:
     items = cfg.get("workflow", [])
     if not items:
-        return ""
-    return f"## {T('workflow')}\n\n{_numbered(items)}\n"
+        return None
+    return f"## {cfg['_headers']['workflow']}\n\n" + "".join(f"{i}. {x}\n" for i, x in enumerate(items, 1))
 
 
-def render_thinking(cfg: dict) -> str:
+def render_thinking(cfg: dict) -> Optional[str]:
     """Claude Code 思考策略引导——这是让 CLAUDE.md 真正能驱动 Claude 的核心增量"""
     items = cfg.get("thinking_strategy", [])
     if not items:
-        return ""
-    lines = [f"## {T('thinking')}", ""]
-    lines.append(_bullet(items))
-    lines.append("")
-    return "\n".join(lines)
+        return None
+    return f"## {cfg['_headers']['thinking']}\n\n{_bullet(items)}"
 
 
-def render_testing(cfg: dict) -> str:
+def render_testing(cfg: dict) -> Optional[str]:
     items = cfg.get("testing_rules", [])
     if not items:
-        return ""
-    return f"## {T('testing')}\n\n{_bullet(items)}\n"
+        return None
+    return f"## {cfg['_headers']['testing']}\n\n{_bullet(items)}"
 
 
-def render_error(cfg: dict) -> str:
+def render_error(cfg: dict) -> Optional[str]:
     items = cfg.get("error_handling", [])
     if not items:
-        return ""
-    return f"## {T('error')}\n\n{_bullet(items)}\n"
+        return None
+    return f"## {cfg['_headers']['error']}\n\n{_bullet(items)}"
 
 
-def render_security(cfg: dict) -> str:
+def render_security(cfg: dict) -> Optional[str]:
     items = cfg.get("security_rules", [])
     if not items:
-        return ""
-    return f"## {T('security')}\n\n{_bullet(items)}\n"
+        return None
+    return f"## {cfg['_headers']['security']}\n\n{_bullet(items)}"
 
 
-def render_git(cfg: dict) -> str:
+def render_git(cfg: dict) -> Optional[str]:
     items = cfg.get("git_rules", [])
     if not items:
-        return ""
-    return f"## {T('git')}\n\n{_bullet(items)}\n"
+        return None
+    return f"## {cfg['_headers']['git']}\n\n{_bullet(items)}"
 
 
-def render_hard(cfg: dict) -> str:
+def render_hard(cfg: dict) -> Optional[str]:
     items = cfg.get("hard_rules", [])
     if not items:
-        return ""
-    warn = L("重要：以下规则绝对不可违反。", "IMPORTANT: The following rules must NEVER be violated.")
-    lines = [f"## {T('hard')}", "", warn, ""]
-    for item in items:
-        lines.append(f"- ❌ {item}")
-    lines.append("")
-    return "\n".join(lines)
+        return None
+    return f"## {cfg['_headers']['hard']}\n\n{_HARD_WARN}\n\n{_bullet(items, '- ❌')}"
 
 
-def render_gotchas(cfg: dict) -> str:
+def render_gotchas(cfg: dict) -> Optional[str]:
     items = cfg.get("gotchas", [])
     if not items:
-        return ""
-    lines = [f"## {T('gotchas')}", ""]
-    for item in items:
-        lines.append(f"- ⚠️ {item}")
-    lines.append("")
-    return "\n".join(lines)
+        return None
+    return f"## {cfg['_headers']['gotchas']}\n\n{_bullet(items, '- ⚠️')}"
 
 
-def render_verify(cfg: dict) -> str:
+def render_verify(cfg: dict) -> Optional[str]:
     """验证检查清单——让 Claude Code 在完成任务后自我验证"""
     items = cfg.get("verification", [])
     if not items:
-        return ""
-    title = L(
-        "完成任何修改后，必须按以下清单逐项验证：",
-        "After completing any change, verify each item below:"
-    )
-    lines = [f"## {T('verify')}", "", title, ""]
-    for item in items:
-        lines.append(f"- [ ] {item}")
-    lines.append("")
-    return "\n".join(lines)
+        return None
+    return f"## {cfg['_headers']['verify']}\n\n{_VERIFY_INTRO}\n\n{_bullet(items, '- [ ]')}"
 
 
-def render_references(cfg: dict) -> str:
+def render_references(cfg: dict) -> Optional[str]:
     items = cfg.get("references", [])
     if not items:
-        return ""
-    return f"## {T('references')}\n\n{_bullet(items)}\n"
+        return None
+    return f"## {cfg['_headers']['references']}\n\n{_bullet(items)}"
 
 
 # 渲染管线 — 按顺序组装
@@ -336,9 +351,18 @@ _RENDERERS = [
     render_git, render_hard, render_gotchas, render_verify, render_references,
 ]
 
+def assemble_iter(cfg: dict) -> Iterator[str]:
+    """按顺序逐段产出非空章节，供不需要完整字符串的场景直接流式输出"""
+    # 当前语言的标题表随 cfg 一次性传给所有渲染器（浅拷贝，不改动调用方的 cfg）
+    cfg = dict(cfg, _headers=_TITLES_ACTIVE)
+    for fn in _RENDERERS:
+        part = fn(cfg)
+        # 空章节返回 None，直接按真值过滤
+        if part:
+            yield part
+
 def assemble(cfg: dict) -> str:
-    parts = [fn(cfg) for fn in _RENDERERS]
-    return "\n".join(p for p in parts if p.strip())
+    return "\n".join(assemble_iter(cfg))
 
 
 # ============================================================================
@@ -444,6 +468,54 @@ def step_project_info(cfg: dict):
     cfg["project_status"] = ask(L("项目状态", "Project status"), L("开发中", "Active development"))
 
 
+# 技术栈字段标签 — 导入时按语言预先拼好 "**标签**"，set_lang() 切换当前表
+_TECH_LABELS = {
+    "language":        ("语言", "Language"),
+    "http_framework":  ("HTTP 框架", "HTTP Framework"),
+    "web_framework":   ("Web 框架", "Web Framework"),
+    "database":        ("数据库", "Database"),
+    "db_access":       ("数据库访问", "DB Access"),
+    "orm":             ("ORM", "ORM"),
+    "migration":       ("迁移工具", "Migration"),
+    "config":          ("配置管理", "Config"),
+    "validation":      ("数据验证", "Validation"),
+    "package_manager": ("包管理", "Package Manager"),
+    "lint":            ("Lint / Format", "Lint / Format"),
+    "type_check":      ("类型检查", "Type Check"),
+    "test_framework":  ("测试框架", "Test Framework"),
+    "logging":         ("日志", "Logging"),
+    "observability":   ("可观测性", "Observability"),
+    "deploy":          ("部署", "Deploy"),
+    "os":              ("操作系统", "OS"),
+    "cloud":           ("云平台", "Cloud"),
+    "iac":             ("IaC 工具", "IaC"),
+    "config_mgmt":     ("配置管理", "Config Mgmt"),
+    "container":       ("容器", "Container"),
+    "orchestration":   ("编排", "Orchestration"),
+    "cicd":            ("CI/CD", "CI/CD"),
+    "monitoring":      ("监控", "Monitoring"),
+    "secrets":         ("密钥管理", "Secrets"),
+    "scripting":       ("脚本", "Scripting"),
+    "frontend":        ("前端", "Frontend"),
+    "backend":         ("后端", "Backend"),
+    "api_style":       ("API 风格", "API Style"),
+    "processing":      ("数据处理", "Processing"),
+    "scheduling":      ("调度", "Orchestration"),
+    "storage":         ("存储", "Storage"),
+    "warehouse":       ("数据仓库", "Warehouse"),
+    "infrastructure":  ("基础设施", "Infrastructure"),
+}
+_TECH_LABELS_ZH = {k: f"**{zh}**" for k, (zh, _) in _TECH_LABELS.items()}
+_TECH_LABELS_EN = {k: f"**{en}**" for k, (_, en) in _TECH_LABELS.items()}
+
+# 标题表与技术栈标签均已定义，按默认语言初始化各项预计算文案
+set_lang(_LANG)
+
+
+def _tech_prefix(key: str) -> str:
+    return _TECH_LABELS_ACTIVE[key]
+
+
 def step_tech_go(cfg: dict):
     print(sub(L("Go 技术栈配置", "Go Tech Stack")))
     go_ver = ask(L("Go 版本", "Go version"), "Go 1.23+")
@@ -457,16 +529,16 @@ def step_tech_go(cfg: dict):
     infra = ask(L("部署目标", "Deploy target"), "Docker + Kubernetes")
     os_env = ask(L("操作系统", "OS"), "Linux (Ubuntu 22.04+)")
     cfg["tech_items"] = [
-        f"**{L('语言','Language')}**: {go_ver}",
-        f"**{L('HTTP 框架','HTTP Framework')}**: {framework}",
-        f"**{L('数据库','Database')}**: {db}",
-        f"**{L('数据库访问','DB Access')}**: {orm}",
-        f"**{L('迁移工具','Migration')}**: {migration}",
-        f"**{L('配置管理','Config')}**: {config}",
-        f"**{L('日志','Logging')}**: {logging}",
-        f"**{L('可观测性','Observability')}**: {observability}",
-        f"**{L('部署','Deploy')}**: {infra}",
-        f"**{L('操作系统','OS')}**: {os_env}",
+        f"{_tech_prefix('language')}: {go_ver}",
+        f"{_tech_prefix('http_framework')}: {framework}",
+        f"{_tech_prefix('database')}: {db}",
+        f"{_tech_prefix('db_access')}: {orm}",
+        f"{_tech_prefix('migration')}: {migration}",
+        f"{_tech_prefix('config')}: {config}",
+        f"{_tech_prefix('logging')}: {logging}",
+        f"{_tech_prefix('observability')}: {observability}",
+        f"{_tech_prefix('deploy')}: {infra}",
+        f"{_tech_prefix('os')}: {os_env}",
     ]
     if ask_yn(L("是否有其他技术组件?", "Any other tech components?"), False):
         extras = ask_lines(L("补充技术组件", "Additional components"))
@@ -488,18 +560,18 @@ def step_tech_python(cfg: dict):
     infra = ask(L("部署目标", "Deploy target"), "Docker + Kubernetes")
     os_env = ask(L("操作系统", "OS"), "Linux (Ubuntu 22.04+)")
     cfg["tech_items"] = [
-        f"**{L('语言','Language')}**: {py_ver}",
-        f"**{L('Web 框架','Web Framework')}**: {framework}",
-        f"**{L('数据库','Database')}**: {db}",
-        f"**{L('ORM','ORM')}**: {orm}",
-        f"**{L('迁移工具','Migration')}**: {migration}",
-        f"**{L('数据验证','Validation')}**: {validation}",
-        f"**{L('包管理','Package Manager')}**: {pkg_mgr}",
-        f"**{L('Lint / Format','Lint / Format')}**: {lint}",
-        f"**{L('类型检查','Type Check')}**: {typecheck}",
-        f"**{L('测试框架','Test Framework')}**: {test_fw}",
-        f"**{L('部署','Deploy')}**: {infra}",
-        f"**{L('操作系统','OS')}**: {os_env}",
+        f"{_tech_prefix('language')}: {py_ver}",
+        f"{_tech_prefix('web_framework')}: {framework}",
+        f"{_tech_prefix('database')}: {db}",
+        f"{_tech_prefix('orm')}: {orm}",
+        f"{_tech_prefix('migration')}: {migration}",
+        f"{_tech_prefix('validation')}: {validation}",
+        f"{_tech_prefix('package_manager')}: {pkg_mgr}",
+        f"{_tech_prefix('lint')}: {lint}",
+        f"{_tech_prefix('type_check')}: {typecheck}",
+        f"{_tech_prefix('test_framework')}: {test_fw}",
+        f"{_tech_prefix('deploy')}: {infra}",
+        f"{_tech_prefix('os')}: {os_env}",
     ]
 
 
@@ -517,17 +589,17 @@ def step_tech_devops(cfg: dict):
     scripting = ask(L("脚本语言", "Scripting languages"), "Bash, Python, Go")
     os_env = ask(L("操作系统", "OS"), "Ubuntu 22.04 / Amazon Linux 2023")
     cfg["tech_items"] = [
-        f"**{L('云平台','Cloud')}**: {cloud}",
-        f"**{L('IaC 工具','IaC')}**: {iac}",
-        f"**{L('配置管理','Config Mgmt')}**: {config_mgmt}",
-        f"**{L('容器','Container')}**: {container}",
-        f"**{L('编排','Orchestration')}**: {orchestration}",
-        f"**{L('CI/CD','CI/CD')}**: {cicd}",
-        f"**{L('监控','Monitoring')}**: {monitoring}",
-        f"**{L('日志','Logging')}**: {logging}",
-        f"**{L('密钥管理','Secrets')}**: {secrets}",
-        f"**{L('脚本','Scripting')}**: {scripting}",
-        f"**{L('操作系统','OS')}**: {os_env}",
+        f"{_tech_prefix('cloud')}: {cloud}",
+        f"{_tech_prefix('iac')}: {iac}",
+        f"{_tech_prefix('config_mgmt')}: {config_mgmt}",
+        f"{_tech_prefix('container')}: {container}",
+        f"{_tech_prefix('orchestration')}: {orchestration}",
+        f"{_tech_prefix('cicd')}: {cicd}",
+        f"{_tech_prefix('monitoring')}: {monitoring}",
+        f"{_tech_prefix('logging')}: {logging}",
+        f"{_tech_prefix('secrets')}: {secrets}",
+        f"{_tech_prefix('scripting')}: {scripting}",
+        f"{_tech_prefix('os')}: {os_env}",
     ]
 
 
@@ -541,11 +613,11 @@ def step_tech_fullstack(cfg: dict):
     api_style = ask(L("API 风格", "API style"), "RESTful + OpenAPI")
     infra = ask(L("部署方式", "Deployment"), "Docker + Vercel (FE) + K8s (BE)")
     cfg["tech_items"] = [
-        f"**{L('前端','Frontend')}**: {fe_lang} + {fe_framework}",
-        f"**{L('后端','Backend')}**: {be_lang} + {be_framework}",
-        f"**{L('数据库','Database')}**: {db}",
-        f"**{L('API 风格','API Style')}**: {api_style}",
-        f"**{L('部署','Deploy')}**: {infra}",
+        f"{_tech_prefix('frontend')}: {fe_lang} + {fe_framework}",
+        f"{_tech_prefix('backend')}: {be_lang} + {be_framework}",
+        f"{_tech_prefix('database')}: {db}",
+        f"{_tech_prefix('api_style')}: {api_style}",
+        f"{_tech_prefix('deploy')}: {infra}",
     ]
 
 
@@ -559,32 +631,28 @@ def step_tech_data(cfg: dict):
     validation = ask(L("数据验证", "Data validation"), "pandera / great_expectations")
     infra = ask(L("基础设施", "Infrastructure"), "Docker, Airflow")
     cfg["tech_items"] = [
-        f"**{L('语言','Language')}**: {lang}",
-        f"**{L('数据处理','Processing')}**: {processing}",
-        f"**{L('调度','Orchestration')}**: {orchestration}",
-        f"**{L('存储','Storage')}**: {storage}",
-        f"**{L('数据仓库','Warehouse')}**: {warehouse}",
-        f"**{L('数据验证','Validation')}**: {validation}",
-        f"**{L('基础设施','Infrastructure')}**: {infra}",
+        f"{_tech_prefix('language')}: {lang}",
+        f"{_tech_prefix('processing')}: {processing}",
+        f"{_tech_prefix('scheduling')}: {orchestration}",
+        f"{_tech_prefix('storage')}: {storage}",
+        f"{_tech_prefix('warehouse')}: {warehouse}",
+        f"{_tech_prefix('validation')}: {validation}",
+        f"{_tech_prefix('infrastructure')}: {infra}",
     ]
 
 
 def step_tech_generic(cfg: dict):
     print(sub(L("技术栈配置", "Tech Stack")))
     cfg["tech_items"] = []
-    print(f"  {c(L('逐行输入技术组件，格式自由，空行结束', 'Enter tech items, one per line, empty to finish'), C.DIM)}")
-    print(f"  {c(L('例如: **语言**: Go 1.23+', 'e.g.: **Language**: Go 1.23+'), C.DIM)}")
-    while True:
-        line = input("    > ").strip()
-        if not line:
-            break
-        cfg["tech_items"].append(line)
+    print(f"  {c(L('逐行输入技术组件，格式自由，空行结束', 'Enter tech items, one per line, empty to finish'), _DIM)}")
+    print(f"  {c(L('例如: **语言**: Go 1.23+', 'e.g.: **Language**: Go 1.23+'), _DIM)}")
+    cfg["tech_items"].extend(_read_lines())
 
 
 def step_project_structure(cfg: dict):
     print(sub(L("项目结构", "Project Structure")))
     if ask_yn(L("是否添加目录结构?", "Add directory structure?"), True):
-        print(f"  {c(L('粘贴 tree 输出，空行结束', 'Paste tree output, empty to finish'), C.DIM)}")
+        print(f"  {c(L('粘贴 tree 输出，空行结束', 'Paste tree output, empty to finish'), _DIM)}")
         lines = ask_lines(L("目录结构", "Directory structure"))
         cfg["project_structure"] = "\n".join(lines)
 
@@ -596,29 +664,29 @@ def step_commands(cfg: dict):
 
 def step_code_style(cfg: dict):
     print(sub(L("代码规范", "Code Style")))
-    print(f"  {c(L('提示：格式化/lint 最好交给工具，这里写 Claude 无法推断的约定', 'Tip: let linters handle formatting; write conventions Claude cannot infer'), C.DIM)}")
+    print(f"  {c(L('提示：格式化/lint 最好交给工具，这里写 Claude 无法推断的约定', 'Tip: let linters handle formatting; write conventions Claude cannot infer'), _DIM)}")
     cfg["code_style_rules"] = ask_lines(L("代码规范", "Code style rules"))
 
 
 def step_core_rules(cfg: dict):
     print(sub(L("核心规范", "Core Rules")))
-    print(f"  {c(L('只写「不写就会出错」的规则，保持精简', 'Only rules that prevent mistakes. Keep it lean.'), C.DIM)}")
+    print(f"  {c(L('只写「不写就会出错」的规则，保持精简', 'Only rules that prevent mistakes. Keep it lean.'), _DIM)}")
     cfg["core_rules"] = ask_lines(L("核心规范", "Core rules"))
 
 
 def step_iac_rules(cfg: dict):
     """运维角色特有：IaC / 基础设施规则"""
     print(sub(L("基础设施与 IaC 规范", "Infrastructure & IaC Rules")))
-    print(f"  {c(L('涵盖 Terraform/Ansible/K8s/脚本 等规范', 'Terraform, Ansible, K8s, scripts, etc.'), C.DIM)}")
+    print(f"  {c(L('涵盖 Terraform/Ansible/K8s/脚本 等规范', 'Terraform, Ansible, K8s, scripts, etc.'), _DIM)}")
     cfg["core_rules"] = ask_lines(L("IaC 核心规范", "IaC core rules"))
-    print(f"\n  {c(L('Shell 脚本规范:', 'Shell scripting rules:'), C.CYN)}")
+    print(f"\n  {c(L('Shell 脚本规范:', 'Shell scripting rules:'), _CYN)}")
     cfg["code_style_rules"] = ask_lines(L("脚本 / 代码规范", "Script / code style"))
 
 
 def step_data_rules(cfg: dict):
     """数据工程角色特有：数据质量规则"""
     print(sub(L("数据工程规范", "Data Engineering Rules")))
-    print(f"  {c(L('数据正确性、幂等、质量校验等', 'Correctness, idempotency, quality checks, etc.'), C.DIM)}")
+    print(f"  {c(L('数据正确性、幂等、质量校验等', 'Correctness, idempotency, quality checks, etc.'), _DIM)}")
     cfg["core_rules"] = ask_lines(L("数据工程核心规范", "Data engineering core rules"))
     cfg["code_style_rules"] = ask_lines(L("代码规范", "Code style rules"))
 
@@ -631,7 +699,7 @@ def step_monitoring(cfg: dict):
 
 def step_workflow(cfg: dict):
     print(sub(L("工作流程", "Workflow")))
-    print(f"  {c(L('Claude Code 处理任务时应该遵循的步骤', 'Steps Claude Code should follow when handling tasks'), C.DIM)}")
+    print(f"  {c(L('Claude Code 处理任务时应该遵循的步骤', 'Steps Claude Code should follow when handling tasks'), _DIM)}")
     cfg["workflow"] = ask_lines(L("工作流步骤", "Workflow steps"))
 
 
@@ -657,7 +725,7 @@ def step_git(cfg: dict):
 
 def step_hard_rules(cfg: dict):
     print(sub(L("禁止事项 (NEVER DO)", "Hard Rules (NEVER DO)")))
-    print(f"  {c(L('用 NEVER/禁止 句式写清楚红线', 'Write clear red lines with NEVER'), C.DIM)}")
+    print(f"  {c(L('用 NEVER/禁止 句式写清楚红线', 'Write clear red lines with NEVER'), _DIM)}")
     cfg["hard_rules"] = ask_lines(L("禁止事项", "Hard rules"))
 
 
@@ -668,7 +736,7 @@ def step_gotchas(cfg: dict):
 
 def step_references(cfg: dict):
     print(sub(L("参考资源", "References")))
-    print(f"  {c(L('填入文档路径或链接让 Claude 需要时去查', 'Paths or URLs Claude can consult when needed'), C.DIM)}")
+    print(f"  {c(L('填入文档路径或链接让 Claude 需要时去查', 'Paths or URLs Claude can consult when needed'), _DIM)}")
     cfg["references"] = ask_lines(L("参考资源", "References"))
 
 
@@ -698,12 +766,99 @@ STEP_REGISTRY = {
     "references":        step_references,
 }
 
+# 预先把每个角色的步骤名解析为函数元组，向导运行时直接遍历
+for _rd in ROLE_DEFS.values():
+    _rd["wizard_callables"] = tuple(STEP_REGISTRY[s] for s in _rd["wizard_steps"])
+del _rd
+
+# 角色选择菜单的 (key, 显示名) 列表，按语言预先构建
+_ROLE_OPTIONS = tuple(
+    tuple((rd["key"], rd["label_" + lang]) for rd in ROLE_DEFS.values())
+    for lang in ("zh", "en")
+)
+
 
 # ============================================================================
 # 预设模板 — 内容大幅增加，加入 thinking_strategy 和 verification
 # ============================================================================
 
-def _go_api_preset(lang: str) -> dict:
+# 预设中的目录树（已左对齐，无需 textwrap.dedent）
+_GO_API_TREE_ZH = """\
+.
+├── cmd/              # 应用入口
+│   └── server/       # API 服务主程序
+├── internal/         # 私有代码（不可被外部导入）
+│   ├── handler/      # HTTP 处理器
+│   ├── service/      # 业务逻辑层
+│   ├── repository/   # 数据访问层
+│   ├── model/        # 领域模型
+│   └── middleware/   # HTTP 中间件
+├── pkg/              # 可复用公共包
+├── api/              # OpenAPI/Swagger 规范
+├── migrations/       # 数据库迁移文件
+├── deploy/           # 部署配置 (Dockerfile, K8s)
+├── scripts/          # 构建与工具脚本
+├── Makefile
+├── go.mod
+└── CLAUDE.md"""
+
+_GO_API_TREE_EN = """\
+.
+├── cmd/              # Application entrypoints
+│   └── server/       # Main API server
+├── internal/         # Private application code
+│   ├── handler/      # HTTP handlers
+│   ├── service/      # Business logic
+│   ├── repository/   # Data access layer
+│   ├── model/        # Domain models
+│   └── middleware/   # HTTP middleware
+├── pkg/              # Public reusable packages
+├── api/              # OpenAPI/Swagger specs
+├── migrations/       # Database migrations
+├── deploy/           # Deployment configs (Docker, K8s)
+├── scripts/          # Build and utility scripts
+├── Makefile
+├── go.mod
+└── CLAUDE.md"""
+
+_DEVOPS_TREE = """\
+.
+├── terraform/
+│   ├── modules/        # {m}
+│   ├── environments/   # {e}
+│   │   ├── dev/
+│   │   ├── staging/
+│   │   └── prod/
+│   └── global/         # {g}
+├── ansible/
+│   ├── roles/
+│   ├── playbooks/
+│   └── inventory/
+├── k8s/
+│   ├── base/           # Kustomize base
+│   └── overlays/       # {o}
+├── docker/
+├── scripts/            # {s}
+├── .github/workflows/  # CI/CD
+├── Makefile
+└── CLAUDE.md"""
+_DEVOPS_TREE_ZH = _DEVOPS_TREE.format(
+    m="可复用 TF 模块",
+    e="按环境区分配置",
+    g="全局共享资源",
+    o="按环境覆盖层",
+    s="运维脚本",
+)
+_DEVOPS_TREE_EN = _DEVOPS_TREE.format(
+    m="Reusable TF modules",
+    e="Per-environment configs",
+    g="Global shared resources",
+    o="Per-env overlays",
+    s="Operational scripts",
+)
+
+
+def _build_go_api_preset(lang: str) -> dict:
     zh = (lang == "zh")
     return {
         "project_name": "my-go-api",
@@ -711,13 +866,13 @@ def _go_api_preset(lang: str) -> dict:
         "project_type": "Backend API Service",
         "project_status": "开发中" if zh else "Active development",
         "role": "senior Go backend engineer with expertise in high-performance API design, concurrency patterns, and production-grade systems",
-        "persona_extras": [
+        "persona_extras": (
             "Write idiomatic Go — simple, readable, and explicit",
             "Prefer stdlib solutions over third-party libraries when reasonable",
             "Think about performance, but measure before optimizing",
             "When unsure about project conventions, read existing code in `internal/` first",
-        ],
-        "tech_items": [
+        ),
+        "tech_items": (
             f"**{'语言' if zh else 'Language'}**: Go 1.23+",
             f"**{'HTTP 框架' if zh else 'HTTP Framework'}**: Gin / Echo / Chi",
             f"**{'数据库' if zh else 'Database'}**: PostgreSQL + Redis",
@@ -728,42 +883,8 @@ def _go_api_preset(lang: str) -> dict:
             f"**{'可观测性' if zh else 'Observability'}**: OpenTelemetry + Prometheus",
             f"**{'部署' if zh else 'Deploy'}**: Docker + Kubernetes",
             f"**{'操作系统' if zh else 'OS'}**: Linux (Ubuntu 22.04+)",
-        ],
-        "project_structure": textwrap.dedent("""\
-            .
-            ├── cmd/              # 应用入口
-            │   └── server/       # API 服务主程序
-            ├── internal/         # 私有代码（不可被外部导入）
-            │   ├── handler/      # HTTP 处理器
-            │   ├── service/      # 业务逻辑层
-            │   ├── repository/   # 数据访问层
-            │   ├── model/        # 领域模型
-            │   └── middleware/   # HTTP 中间件
-            ├── pkg/              # 可复用公共包
-            ├── api/              # OpenAPI/Swagger 规范
-            ├── migrations/       # 数据库迁移文件
-            ├── deploy/           # 部署配置 (Dockerfile, K8s)
-            ├── scripts/          # 构建与工具脚本
-            ├── Makefile
-            ├── go.mod
-            └── CLAUDE.md""") if zh else textwrap.dedent("""\
-            .
-            ├── cmd/              # Application entrypoints
-            │   └── server/       # Main API server
-            ├── internal/         # Private application code
-            │   ├── handler/      # HTTP handlers
-            │   ├── service/      # Business logic
-            │   ├── repository/   # Data access layer
-            │   ├── model/        # Domain models
-            │   └── middleware/   # HTTP middleware
-            ├── pkg/              # Public reusable packages
-            ├── api/              # OpenAPI/Swagger specs
-            ├── migrations/       # Database migrations
-            ├── deploy/           # Deployment configs (Docker, K8s)
-            ├── scripts/          # Build and utility scripts
-            ├── Makefile
-            ├── go.mod
-            └── CLAUDE.md"""),
+        ),
+        "project_structure": _GO_API_TREE_ZH if zh else _GO_API_TREE_EN,
         "commands": {
             ("启动开发服务" if zh else "Run dev server"):  "go run ./cmd/server",
             ("运行全部测试" if zh else "Run all tests"):   "go test ./...",
@@ -773,7 +894,7 @@ def _go_api_preset(lang: str) -> dict:
             ("数据库迁移" if zh else "Migration up"):      "migrate -path migrations -database $DB_URL up",
             ("生成 Mock" if zh else "Generate mocks"):     "go generate ./...",
         },
-        "code_style_rules": [
+        "code_style_rules": (
             ("遵循 Effective Go 和 Go Code Review Comments" if zh else "Follow Effective Go and Go Code Review Comments"),
             ("`gofmt` / `goimports` 格式化——不争论风格" if zh else "`gofmt` / `goimports` for formatting — never argue about style"),
             ("导出名称必须有文档注释" if zh else "Exported names must have doc comments"),
@@ -781,8 +902,8 @@ def _go_api_preset(lang: str) -> dict:
             ("使用 Table-Driven 测试" if zh else "Use table-driven tests"),
             ("错误信息：小写、无标点、用 `fmt.Errorf(\"doing x: %w\", err)` 包装" if zh else "Error messages: lowercase, no punctuation, wrap with `fmt.Errorf(\"doing x: %w\", err)`"),
             ("接口按行为命名: `Reader`, `Validator`，不用 `IReader`" if zh else "Name interfaces by behavior: `Reader`, `Validator`, not `IReader`"),
-        ],
-        "core_rules": [
+        ),
+        "core_rules": (
             ("始终处理错误——禁止用 `_` 丢弃 error" if zh else "Always handle errors — never use `_` to discard errors"),
             ("I/O 函数的第一个参数必须是 `context.Context`" if zh else "Use `context.Context` as first parameter in functions that do I/O"),
             ("打开资源后立即用 `defer` 关闭" if zh else "Close resources with `defer` immediately after opening"),
@@ -791,48 +912,48 @@ def _go_api_preset(lang: str) -> dict:
             ("所有 SQL 必须使用参数化查询（防 SQL 注入）" if zh else "All SQL must use parameterized queries (prevent SQL injection)"),
             ("HTTP Handler 必须校验和清理所有输入" if zh else "HTTP handlers must validate and sanitize all input"),
             ("共享状态的并发访问必须用 mutex 或 channel 保护" if zh else "Concurrent access to shared state must use mutexes or channels"),
-        ],
-        "workflow": [
+        ),
+        "workflow": (
             ("先阅读相关代码，理解现有模式，再动手修改" if zh else "Read relevant code and understand existing patterns before making changes"),
             ("对非平凡功能，先制定计划并确认后再实现" if zh else "Create a plan and confirm before implementing non-trivial features"),
             ("修改代码时同步编写或更新测试" if zh else "Write or update tests alongside code changes"),
             ("运行 `golangci-lint run ./...` 确保无 lint 问题" if zh else "Run `golangci-lint run ./...` to verify no lint issues"),
             ("运行 `go test ./...` 确保无回归" if zh else "Run `go test ./...` to verify no regressions"),
             ("保持 commit 小且聚焦——一个逻辑变更一个 commit" if zh else "Keep commits small and focused — one logical change per commit"),
-        ],
-        "thinking_strategy": [
+        ),
+        "thinking_strategy": (
             ("接到复杂任务时，先用 think/ultrathink 规划方案，得到确认后再写代码" if zh else "For complex tasks, use think/ultrathink to plan first. Get confirmation before coding."),
             ("遇到不确定的项目约定时，先搜索 `internal/` 目录中的现有代码作为参考" if zh else "When unsure about conventions, search existing code in `internal/` for reference patterns"),
             ("修改公共接口前，先用 grep 查找所有调用方，评估影响范围" if zh else "Before changing public interfaces, grep all callers and assess impact"),
             ("如果任务涉及多个文件，先列出需要修改的文件清单" if zh else "If a task spans multiple files, list all files to change before starting"),
-        ],
-        "testing_rules": [
+        ),
+        "testing_rules": (
             ("用 Table-Driven 测试覆盖多输入场景" if zh else "Use table-driven tests for functions with multiple input/output cases"),
             ("用 `testify/assert` 或标准库 `testing` 做断言" if zh else "Use `testify/assert` or stdlib `testing` for assertions"),
             ("通过接口 Mock 外部依赖，不依赖具体实现" if zh else "Mock external dependencies with interfaces, not concrete types"),
             ("集成测试放在 `_test.go` 中，用 build tag `//go:build integration`" if zh else "Integration tests in `_test.go` files with build tag `//go:build integration`"),
             ("为性能关键路径编写 Benchmark: `func BenchmarkXxx(b *testing.B)`" if zh else "Benchmark critical paths with `func BenchmarkXxx(b *testing.B)`"),
-        ],
-        "error_handling": [
+        ),
+        "error_handling": (
             ("返回错误，不要 panic（除非真正不可恢复）" if zh else "Return errors, don't panic (except truly unrecoverable situations)"),
             ("用上下文包装错误: `fmt.Errorf(\"creating user: %w\", err)`" if zh else "Wrap errors with context: `fmt.Errorf(\"creating user: %w\", err)`"),
             ("用哨兵错误处理预期错误: `var ErrNotFound = errors.New(...)`" if zh else "Use sentinel errors for expected errors: `var ErrNotFound = errors.New(...)`"),
             ("在边界层（handler）记录日志，不在业务逻辑深处" if zh else "Log errors at the boundary (handler), not deep in business logic"),
             ("Handler 层将领域错误映射为对应 HTTP 状态码" if zh else "HTTP handlers: map domain errors to appropriate status codes"),
-        ],
-        "security_rules": [
+        ),
+        "security_rules": (
             ("禁止硬编码密钥——使用环境变量或密钥管理器" if zh else "Never hardcode secrets — use environment variables or secret managers"),
             ("所有用户输入必须验证后再处理" if zh else "All user input must be validated before processing"),
             ("只使用参数化 SQL 查询——禁止字符串拼接 SQL" if zh else "Use parameterized SQL queries exclusively — NO string concatenation"),
             ("所有 HTTP 客户端和数据库连接必须设置超时" if zh else "Set timeouts on all HTTP clients and database connections"),
             ("对外接口实施限流" if zh else "Rate limit public-facing endpoints"),
-        ],
-        "git_rules": [
+        ),
+        "git_rules": (
             ("分支命名: `feature/xxx`, `fix/xxx`, `refactor/xxx`" if zh else "Branch naming: `feature/xxx`, `fix/xxx`, `refactor/xxx`"),
             ("Commit 消息: Conventional Commits 格式 — `type(scope): description`" if zh else "Commit messages: Conventional Commits — `type(scope): description`"),
             ("始终在功能分支开发，禁止直接提交到 main" if zh else "Always work on feature branches, never commit directly to main"),
-        ],
-        "hard_rules": [
+        ),
+        "hard_rules": (
             ("NEVER commit secrets, API keys, passwords, or certificates" if not zh else "禁止提交密钥、API Key、密码或证书到仓库"),
             ("NEVER use `os.Exit()` outside of `main()`" if not zh else "禁止在 `main()` 之外使用 `os.Exit()`"),
             ("NEVER use `panic()` for normal error handling" if not zh else "禁止用 `panic()` 处理常规错误"),
@@ -840,15 +961,15 @@ def _go_api_preset(lang: str) -> dict:
             ("NEVER use `unsafe` package without explicit approval" if not zh else "禁止未经批准使用 `unsafe` 包"),
             ("NEVER modify generated files (protobuf, mocks) by hand" if not zh else "禁止手动修改生成的文件（protobuf, mock 等）"),
             ("NEVER add dependencies without discussing the rationale" if not zh else "禁止未经讨论添加新依赖"),
-        ],
-        "gotchas": [
+        ),
+        "gotchas": (
             ("`internal/` 目录有 Go 包可见性限制——外部模块无法导入" if zh else "`internal/` enforces Go package visibility — external modules cannot import"),
             ("`context.Background()` 只在 `main()` 或顶层使用——其他地方必须传递 context" if zh else "`context.Background()` only in `main()` — pass context everywhere else"),
             ("注意 goroutine 泄漏——始终确保 goroutine 有退出路径" if zh else "Watch for goroutine leaks — always ensure goroutines can exit"),
             ("JSON struct tag 使用 snake_case: `json:\"field_name\"`" if zh else "JSON struct tags use snake_case: `json:\"field_name\"`"),
             ("时间处理: 始终使用 `time.Time` 和 `time.Duration`，不用裸整数" if zh else "Time: always use `time.Time` / `time.Duration`, never raw integers"),
-        ],
-        "verification": [
+        ),
+        "verification": (
             ("`golangci-lint run ./...` 通过，无报错" if zh else "`golangci-lint run ./...` passes with no errors"),
             ("`go test ./...` 全部通过" if zh else "`go test ./...` all pass"),
             ("`go build ./...` 编译成功" if zh else "`go build ./...` compiles successfully"),
@@ -856,16 +977,16 @@ def _go_api_preset(lang: str) -> dict:
             ("没有引入未讨论的新依赖" if zh else "No undiscussed new dependencies introduced"),
             ("没有硬编码的密钥或配置值" if zh else "No hardcoded secrets or config values"),
             ("修改过的代码有对应的测试覆盖" if zh else "Changed code has corresponding test coverage"),
-        ],
-        "references": [
+        ),
+        "references": (
             (f"{'项目布局' if zh else 'Project layout'}: `cmd/`, `internal/`, `pkg/`"),
             (f"{'API 规范' if zh else 'API spec'}: `api/openapi.yaml`"),
             (f"{'部署配置' if zh else 'Deployment'}: `deploy/` (Dockerfile, K8s)"),
             (f"{'业务逻辑示例' if zh else 'Business logic examples'}: `internal/service/`"),
-        ],
+        ),
     }
 
-def _devops_preset(lang: str) -> dict:
+def _build_devops_preset(lang: str) -> dict:
     zh = (lang == "zh")
     return {
         "project_name": "infra",
@@ -873,13 +994,13 @@ def _devops_preset(lang: str) -> dict:
         "project_type": "DevOps / Infrastructure",
         "project_status": "运行中" if zh else "Active",
         "role": "senior DevOps/SRE engineer with deep expertise in Linux, containers, Kubernetes, CI/CD, monitoring, and infrastructure automation",
-        "persona_extras": [
+        "persona_extras": (
             ("每次变更都要考虑幂等性、可靠性和回滚方案" if zh else "Think about idempotency, reliability, and rollback for every change"),
             ("做两次以上的事情就要自动化" if zh else "Automate everything done more than twice"),
             ("基础设施即代码——版本控制、审查、测试" if zh else "Treat infrastructure as code — version control, review, test"),
             ("变更前评估影响范围（爆炸半径）" if zh else "Always consider blast radius before applying changes"),
-        ],
-        "tech_items": [
+        ),
+        "tech_items": (
             f"**{'云平台' if zh else 'Cloud'}**: AWS / GCP / Azure",
             f"**{'IaC' if zh else 'IaC'}**: Terraform",
             f"**{'配置管理' if zh else 'Config Mgmt'}**: Ansible",
@@ -891,34 +1012,8 @@ def _devops_preset(lang: str) -> dict:
             f"**{'密钥管理' if zh else 'Secrets'}**: Vault / AWS Secrets Manager",
             f"**{'脚本' if zh else 'Scripting'}**: Bash, Python, Go",
             f"**{'操作系统' if zh else 'OS'}**: Ubuntu 22.04 / Amazon Linux 2023",
-        ],
-        "project_structure": textwrap.dedent("""\
-            .
-            ├── terraform/
-            │   ├── modules/        # {m}
-            │   ├── environments/   # {e}
-            │   │   ├── dev/
-            │   │   ├── staging/
-            │   │   └── prod/
-            │   └── global/         # {g}
-            ├── ansible/
-            │   ├── roles/
-            │   ├── playbooks/
-            │   └── inventory/
-            ├── k8s/
-            │   ├── base/           # Kustomize base
-            │   └── overlays/       # {o}
-            ├── docker/
-            ├── scripts/            # {s}
-            ├── .github/workflows/  # CI/CD
-            ├── Makefile
-            └── CLAUDE.md""".format(
-                m="可复用 TF 模块" if zh else "Reusable TF modules",
-                e="按环境区分配置" if zh else "Per-environment configs",
-                g="全局共享资源" if zh else "Global shared resources",
-                o="按环境覆盖层" if zh else "Per-env overlays",
-                s="运维脚本" if zh else "Operational scripts",
-            )),
+        ),
+        "project_structure": _DEVOPS_TREE_ZH if zh else _DEVOPS_TREE_EN,
         "commands": {
             ("TF 初始化" if zh else "TF init"):           "cd terraform/environments/dev && terraform init",
             ("TF 计划" if zh else "TF plan"):              "terraform plan -var-file=terraform.tfvars",
@@ -930,14 +1025,14 @@ def _devops_preset(lang: str) -> dict:
             ("TF 格式化" if zh else "TF format"):          "terraform fmt -check -recursive",
             ("Shell 检查" if zh else "Shell lint"):         "shellcheck scripts/*.sh",
         },
-        "code_style_rules": [
+        "code_style_rules": (
             ("Shell 脚本: 开头必须 `set -euo pipefail`" if zh else "Shell scripts: `set -euo pipefail` at the top"),
             ("Shell 脚本: 必须通过 `shellcheck`" if zh else "Shell scripts: must pass `shellcheck`"),
             ("Terraform: `terraform fmt` 格式化，`tflint` 检查" if zh else "Terraform: `terraform fmt` + `tflint`"),
             ("YAML: 2 空格缩进，不用 Tab" if zh else "YAML: 2-space indent, no tabs"),
             ("命名: 资源用 snake_case, K8s 对象用 kebab-case" if zh else "Naming: snake_case for resources, kebab-case for k8s objects"),
-        ],
-        "core_rules": [
+        ),
+        "core_rules": (
             ("所有基础设施变更必须通过代码审查 (PR)" if zh else "ALL infrastructure changes must go through PR review"),
             ("执行 `terraform apply` 前必须先 `plan` 并审查" if zh else "ALWAYS run `terraform plan` and review before `terraform apply`"),
             ("生产环境变更必须有回滚方案" if zh else "Production changes must have a documented rollback plan"),
@@ -945,44 +1040,44 @@ def _devops_preset(lang: str) -> dict:
             ("所有云资源打标签: environment, team, managed-by" if zh else "Tag all cloud resources: environment, team, managed-by"),
             ("Terraform 状态必须用远端存储 + 锁" if zh else "Use remote state with locking for Terraform"),
             ("密钥必须在 Vault 或云密钥管理器中，禁止写在代码里" if zh else "Secrets must be in Vault or cloud secret managers, never in code"),
-        ],
-        "workflow": [
+        ),
+        "workflow": (
             ("先了解当前基础设施状态和模块结构" if zh else "Read the current infrastructure state and module structure first"),
             ("制定变更计划：影响哪些模块、哪些环境、回滚步骤" if zh else "Plan: which modules, which environments, rollback steps"),
             ("按 dev → staging → prod 顺序逐环境应用" if zh else "Apply in dev → staging → prod order"),
             ("每个环境变更后运行冒烟测试验证" if zh else "Verify with smoke tests after each environment"),
             ("变更完成后更新文档和 runbook" if zh else "Update docs and runbooks after changes"),
-        ],
-        "thinking_strategy": [
+        ),
+        "thinking_strategy": (
             ("变更基础设施前，先列出影响的资源和依赖关系" if zh else "Before infra changes, list affected resources and dependencies"),
             ("高风险操作（删除、迁移状态）前，先确认备份和回滚方案" if zh else "Before high-risk ops (destroy, state mv), confirm backup and rollback"),
             ("不确定时，先用 `terraform plan` 输出评估影响" if zh else "When unsure, assess impact with `terraform plan` output first"),
             ("跨环境变更时，先在 dev 验证，确认后再推进" if zh else "For cross-env changes, validate in dev first before proceeding"),
-        ],
-        "testing_rules": [
+        ),
+        "testing_rules": (
             ("`terraform validate` + `tflint` 检查所有 TF 代码" if zh else "`terraform validate` + `tflint` on all TF code"),
             ("`tfsec` / `checkov` 安全扫描" if zh else "`tfsec` / `checkov` for security scanning"),
             ("Shell 脚本: `shellcheck` + `bats` 测试框架" if zh else "Shell scripts: `shellcheck` + `bats` testing"),
             ("Ansible: `molecule` 测试角色" if zh else "Ansible: `molecule` for role testing"),
-        ],
-        "error_handling": [
+        ),
+        "error_handling": (
             ("Shell: `set -e` 快速失败; `trap` 清理资源" if zh else "Shell: `set -e` fail fast; `trap` for cleanup"),
             ("Terraform: 隐式依赖不够时显式使用 `depends_on`" if zh else "Terraform: use `depends_on` explicitly when implicit deps aren't enough"),
             ("始终有回滚方案: 上一版 TF 状态、上一版 K8s 清单" if zh else "Always have rollback: previous TF state, previous K8s manifests"),
-        ],
-        "security_rules": [
+        ),
+        "security_rules": (
             ("禁止在 Terraform/Ansible/脚本中硬编码密钥" if zh else "NEVER hardcode secrets in Terraform, Ansible, or scripts"),
             ("IAM 最小权限——生产环境禁止 wildcard (*)" if zh else "Least-privilege IAM — no wildcard (*) in production"),
             ("所有存储和数据库启用静态加密 + 传输加密" if zh else "Enable encryption at rest and in transit for all data stores"),
             ("Docker 镜像漏洞扫描 (Trivy/Snyk)" if zh else "Scan Docker images for vulnerabilities (Trivy/Snyk)"),
             ("网络: 默认拒绝，仅放行所需流量" if zh else "Network: default-deny; allow only required traffic"),
-        ],
-        "git_rules": [
+        ),
+        "git_rules": (
             ("分支: `infra/xxx` 用于基础设施变更" if zh else "Branch: `infra/xxx` for infrastructure changes"),
             ("Conventional Commits: `infra(scope): description`" if zh else "Conventional Commits: `infra(scope): description`"),
             ("PR 描述中包含 `terraform plan` 输出" if zh else "Include `terraform plan` output in PR description"),
-        ],
-        "hard_rules": [
+        ),
+        "hard_rules": (
             ("禁止未经审查的 plan 直接 apply 到生产" if zh else "NEVER `terraform apply` on prod without a reviewed plan"),
             ("禁止提交密钥、Token 或私钥" if zh else "NEVER commit secrets, tokens, or private keys"),
             ("禁止使用 `chmod 777`" if zh else "NEVER use `chmod 777`"),
@@ -990,14 +1085,14 @@ def _devops_preset(lang: str) -> dict:
             ("禁止关闭安全功能（防火墙、SELinux）来排障" if zh else "NEVER disable security features as a troubleshooting step"),
             ("禁止用 `curl | bash` 安装生产软件" if zh else "NEVER use `curl | bash` for production software"),
             ("禁止在版本控制之外修改生产基础设施" if zh else "NEVER modify production infra outside version-controlled IaC"),
-        ],
-        "gotchas": [
+        ),
+        "gotchas": (
             ("Terraform state 含敏感数据——加密且限制访问" if zh else "Terraform state contains secrets — encrypt and restrict access"),
             ("`terraform destroy` 对有状态资源不可逆——反复确认" if zh else "`terraform destroy` is irreversible for stateful resources"),
             ("K8s `default` 命名空间不应跑工作负载" if zh else "K8s `default` namespace should not run workloads"),
             ("Ansible `become: yes` 以 root 执行——注意文件权限" if zh else "Ansible `become: yes` runs as root — watch file permissions"),
-        ],
-        "verification": [
+        ),
+        "verification": (
             ("`terraform fmt -check` 通过" if zh else "`terraform fmt -check` passes"),
             ("`terraform validate` 通过" if zh else "`terraform validate` passes"),
             ("`tflint` 无错误" if zh else "`tflint` has no errors"),
@@ -1005,16 +1100,29 @@ def _devops_preset(lang: str) -> dict:
             ("没有硬编码的密钥或 IP 地址" if zh else "No hardcoded secrets or IP addresses"),
             ("云资源标签完整" if zh else "Cloud resource tags are complete"),
             ("变更有对应的回滚步骤记录" if zh else "Changes have documented rollback steps"),
-        ],
-        "references": [
+        ),
+        "references": (
             (f"{'TF 模块' if zh else 'TF modules'}: `terraform/modules/`"),
             (f"{'环境配置' if zh else 'Env configs'}: `terraform/environments/{{env}}/`"),
             (f"{'K8s 清单' if zh else 'K8s manifests'}: `k8s/` (Kustomize overlays)"),
             (f"{'运维脚本' if zh else 'Scripts'}: `scripts/`"),
-        ],
+        ),
     }
 
 
+# 预设内容只取决于语言，导入时为两种语言各构建一次，工厂直接返回构建好的 dict
+_GO_API_PRESET_ZH = _build_go_api_preset("zh")
+_GO_API_PRESET_EN = _build_go_api_preset("en")
+_DEVOPS_PRESET_ZH = _build_devops_preset("zh")
+_DEVOPS_PRESET_EN = _build_devops_preset("en")
+
+def _go_api_preset(lang: str) -> dict:
+    return _GO_API_PRESET_ZH if lang == "zh" else _GO_API_PRESET_EN
+
+def _devops_preset(lang: str) -> dict:
+    return _DEVOPS_PRESET_ZH if lang == "zh" else _DEVOPS_PRESET_EN
+
+
 # 精简的预设工厂注册表（其余预设复用结构，此处只注册最关键的两个作为演示，其他走通用路径）
 PRESET_FACTORIES = {
     "go-api":       _go_api_preset,
@@ -1034,26 +1142,46 @@ _SIMPLE_PRESET_META = {
     "terraform":     ("Terraform IaC",              "Terraform IaC"),
 }
 
+# 预设名称提示（已着色、已拼接），供 cmd_quick 的错误提示使用
+_BUILT_PRESET_NAMES = ", ".join(c(k, _CYN) for k in PRESET_FACTORIES)
+_ALL_PRESET_NAMES = ", ".join(c(k, _CYN) for k in (*PRESET_FACTORIES, *_SIMPLE_PRESET_META))
+
 
 def _get_preset(name: str) -> Optional[dict]:
-    """获取预设配置"""
-    if name in PRESET_FACTORIES:
-        return PRESET_FACTORIES[name](_LANG)
-    # 未独立实现的预设，返回 None 让调用方提示用户
-    return None
+    """获取当前语言的预设配置；未独立实现的预设返回 None 让调用方提示用户"""
+    factory = PRESET_FACTORIES.get(name)
+    return factory(_LANG) if factory else None
 
 
 # ============================================================================
 # 交互式向导
 # ============================================================================
 
+# 向导未填写时自动补充的默认内容，(中文, 英文) 对
+_DEFAULT_THINKING = (
+    ("接到复杂任务时，先规划方案再实现", "For complex tasks, plan before implementing"),
+    ("不确定项目约定时，先搜索现有代码参考", "When unsure about conventions, search existing code first"),
+    ("修改公共接口前，先查找所有调用方评估影响", "Before changing interfaces, grep callers to assess impact"),
+)
+_DEFAULT_VERIFICATION = (
+    ("lint 检查通过", "Lint checks pass"),
+    ("测试全部通过", "All tests pass"),
+    ("编译成功", "Build succeeds"),
+    ("没有硬编码密钥", "No hardcoded secrets"),
+)
+
+# 向导固定标题，导入时按语言拼好
+_WIZARD_HEADER = (hdr("🧙 CLAUDE.md 交互式生成向导"), hdr("🧙 CLAUDE.md Interactive Generator"))
+_SUB_LANGUAGE = (sub("语言选择"), sub("Language Selection"))
+_SUB_ROLE = (sub("角色选择"), sub("Role Selection"))
+
 def wizard():
-    print(hdr("🧙 CLAUDE.md " + L("交互式生成向导", "Interactive Generator")))
-    print(f"  {c(L('按步骤回答，生成适合你项目的 CLAUDE.md', 'Answer step by step to generate your CLAUDE.md'), C.DIM)}")
-    print(f"  {c(L('回车使用默认值，Ctrl+C 退出', 'Enter for defaults, Ctrl+C to exit'), C.DIM)}")
+    print(_WIZARD_HEADER[_L_INDEX])
+    print(f"  {c(L('按步骤回答，生成适合你项目的 CLAUDE.md', 'Answer step by step to generate your CLAUDE.md'), _DIM)}")
+    print(f"  {c(L('回车使用默认值，Ctrl+C 退出', 'Enter for defaults, Ctrl+C to exit'), _DIM)}")
 
     # Step 0: 选语言
-    print(sub(L("语言选择", "Language Selection")))
+    print(_SUB_LANGUAGE[_L_INDEX])
     lang_choice = ask_multi(L("CLAUDE.md 输出语言", "CLAUDE.md output language"), [
         ("zh", "中文"),
         ("en", "English"),
@@ -1061,10 +1189,9 @@ def wizard():
     set_lang(lang_choice)
 
     # Step 1: 选角色
-    print(sub(L("角色选择", "Role Selection")))
-    print(f"  {c(L('不同角色会有不同的引导步骤和默认内容', 'Different roles have different wizard steps'), C.DIM)}")
-    role_options = [(rd["key"], rd[f"label_{_LANG}"]) for rd in ROLE_DEFS.values()]
-    role_key = ask_multi(L("你的角色", "Your role"), role_options, default="go_backend")
+    print(_SUB_ROLE[_L_INDEX])
+    print(f"  {c(L('不同角色会有不同的引导步骤和默认内容', 'Different roles have different wizard steps'), _DIM)}")
+    role_key = ask_multi(L("你的角色", "Your role"), _ROLE_OPTIONS[_L_INDEX], default="go_backend")
 
     role_def = ROLE_DEFS[role_key]
     cfg = {
@@ -1076,35 +1203,24 @@ def wizard():
         cfg["role"] = ask(L("描述你的角色", "Describe your role"))
 
     # 角色特征
-    print(f"\n  {c(L('为角色补充额外要求（可选，空行跳过）', 'Add extra persona requirements (optional, empty to skip)'), C.DIM)}")
+    print(f"\n  {c(L('为角色补充额外要求（可选，空行跳过）', 'Add extra persona requirements (optional, empty to skip)'), _DIM)}")
     extras = ask_lines(L("角色特征", "Persona extras"))
     cfg["persona_extras"] = extras
 
     # 按角色的 wizard_steps 执行
-    steps = role_def["wizard_steps"]
+    steps = role_def["wizard_callables"]
     total = len(steps)
-    for i, step_name in enumerate(steps, 1):
-        step_fn = STEP_REGISTRY.get(step_name)
-        if step_fn:
-            print(f"\n  {c(f'[{i}/{total}]', C.DIM)}")
-            step_fn(cfg)
+    for i, step_fn in enumerate(steps, 1):
+        print(f"\n  {c(f'[{i}/{total}]', _DIM)}")
+        step_fn(cfg)
 
     # 自动填充 thinking_strategy 和 verification（如果向导中用户未填）
     if "thinking_strategy" not in cfg:
-        cfg["thinking_strategy"] = [
-            L("接到复杂任务时，先规划方案再实现", "For complex tasks, plan before implementing"),
-            L("不确定项目约定时，先搜索现有代码参考", "When unsure about conventions, search existing code first"),
-            L("修改公共接口前，先查找所有调用方评估影响", "Before changing interfaces, grep callers to assess impact"),
-        ]
+        cfg["thinking_strategy"] = [pair[_L_INDEX] for pair in _DEFAULT_THINKING]
     if "verification" not in cfg:
         cfg["verification"] = []
-        if any("go" in str(cfg.get("tech_items", [])).lower() for _ in [1]):
-            cfg["verification"] = [
-                L("lint 检查通过", "Lint checks pass"),
-                L("测试全部通过", "All tests pass"),
-                L("编译成功", "Build succeeds"),
-                L("没有硬编码密钥", "No hardcoded secrets"),
-            ]
+        if any("go" in item.lower() for item in cfg.get("tech_items", ())):
+            cfg["verification"] = [pair[_L_INDEX] for pair in _DEFAULT_VERIFICATION]
 
     return cfg
 
@@ -1113,36 +1229,77 @@ def wizard():
 # 输出与保存
 # ============================================================================
 
+_PREVIEW_LINES = 50
+_PREVIEW_BORDER = "  " + c("─" * 60, _DIM)
+
+# 保存菜单为固定文案，导入时按语言拼好（含 ANSI），{path} 在调用时填入
+_SAVE_HEADER = (sub("保存"), sub("Save"))
+_SAVE_MENU = tuple(
+    f"  {c('[1]', _CYN)} {here} ({{path}})\n"
+    f"  {c('[2]', _CYN)} {custom}\n"
+    f"  {c('[3]', _CYN)} {terminal}\n"
+    f"  {c('[Enter]', _CYN)} {leave}"
+    for here, custom, terminal, leave in (
+        ("保存到当前目录", "保存到指定路径", "输出到终端", "退出"),
+        ("Save to current directory", "Save to custom path", "Print to terminal", "Exit"),
+    )
+)
+
+# 统计行模板：ANSI 与文案预先拼好，数值用 %d 填入，省去 str() + c() 拼接
+_STATS_FMT = tuple(
+    f"  {lines}: {_YLW}%d{_RST} | {chars}: {_YLW}%d{_RST}\n"
+    for lines, chars in (("行数", "字符"), ("Lines", "Chars"))
+)
+
+def _print_stats(nlines: int, nchars: int):
+    sys.stdout.write(_STATS_FMT[_L_INDEX] % (nlines, nchars))
+
+def _write_file(path: str, content: str):
+    """一次性编码后直接写入文件描述符"""
+    data = memoryview(content.encode("utf-8"))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+def _head_lines(text: str, n: int):
+    """惰性产出 text 的前 n 行，不切分剩余部分"""
+    start = 0
+    for _ in range(n):
+        end = text.find("\n", start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
 def preview_and_save(content: str, default_path: str = "CLAUDE.md"):
-    lines = content.split("\n")
+    nlines = content.count("\n") + 1
     print(hdr(L("✅ 生成完成", "✅ Generation Complete")))
-    print(f"  {L('行数','Lines')}: {c(str(len(lines)), C.YLW)} | {L('字符','Chars')}: {c(str(len(content)), C.YLW)}")
+    _print_stats(nlines, len(content))
     print()
-    border = c("─" * 60, C.DIM)
-    print(f"  {border}")
-    for line in lines[:50]:
-        print(f"  │ {line}")
-    if len(lines) > 50:
-        remaining = len(lines) - 50
-        print(f"  │ {c(f'... ({remaining} more lines)', C.DIM)}")
-    print(f"  {border}")
-
-    print(sub(L("保存", "Save")))
-    print(f"  {c('[1]', C.CYN)} {L('保存到当前目录', 'Save to current directory')} ({default_path})")
-    print(f"  {c('[2]', C.CYN)} {L('保存到指定路径', 'Save to custom path')}")
-    print(f"  {c('[3]', C.CYN)} {L('输出到终端', 'Print to terminal')}")
-    print(f"  {c('[Enter]', C.CYN)} {L('退出', 'Exit')}")
+    # 预览框整体拼好后一次写出
+    out = [f"  │ {line}" for line in _head_lines(content, _PREVIEW_LINES)]
+    if nlines > _PREVIEW_LINES:
+        remaining = nlines - _PREVIEW_LINES
+        out.append(f"  │ {c(f'... ({remaining} more lines)', _DIM)}")
+    sys.stdout.write("\n".join((_PREVIEW_BORDER, *out, _PREVIEW_BORDER)) + "\n")
+
+    print(_SAVE_HEADER[_L_INDEX])
+    print(_SAVE_MENU[_L_INDEX].format(path=default_path))
 
     choice = input(f"\n  {L('选择','Choose')}: ").strip()
     if choice == "1":
-        Path(default_path).write_text(content, encoding="utf-8")
-        print(c(f"\n  ✅ {L('已保存到','Saved to')} ./{default_path}", C.GRN))
-        print(f"  {c(L('提示：提交到 git 让团队共享', 'Tip: commit to git for team sharing'), C.DIM)}")
+        _write_file(default_path, content)
+        print(c(f"\n  ✅ {L('已保存到','Saved to')} ./{default_path}", _GRN))
+        print(f"  {c(L('提示：提交到 git 让团队共享', 'Tip: commit to git for team sharing'), _DIM)}")
     elif choice == "2":
         path = input(f"  {L('路径','Path')}: ").strip() or default_path
         Path(path).parent.mkdir(parents=True, exist_ok=True)
-        Path(path).write_text(content, encoding="utf-8")
-        print(c(f"\n  ✅ {L('已保存到','Saved to')} {path}", C.GRN))
+        _write_file(path, content)
+        print(c(f"\n  ✅ {L('已保存到','Saved to')} {path}", _GRN))
     elif choice == "3":
         print("\n" + content)
 
@@ -1157,14 +1314,14 @@ def cmd_wizard():
         content = assemble(cfg)
         preview_and_save(content)
     except KeyboardInterrupt:
-        print(c(f"\n\n  {L('已取消。','Cancelled.')}", C.YLW))
+        print(c(f"\n\n  {L('已取消。','Cancelled.')}", _YLW))
 
 def cmd_quick(preset_name: str):
     preset = _get_preset(preset_name)
     if preset is None:
-        print(c(f"\n  ❌ {L('预设','Preset')} '{preset_name}' {L('暂未内置详细配置，请使用 wizard 自定义生成','not yet fully built-in. Use wizard for custom generation.')}", C.YLW))
-        print(f"  {L('已内置详细配置的预设','Fully built presets')}: {', '.join(c(k, C.CYN) for k in PRESET_FACTORIES)}")
-        print(f"  {L('全部预设名称','All preset names')}: {', '.join(c(k, C.CYN) for k in list(PRESET_FACTORIES) + list(_SIMPLE_PRESET_META))}")
+        print(c(f"\n  ❌ {L('预设','Preset')} '{preset_name}' {L('暂未内置详细配置，请使用 wizard 自定义生成','not yet fully built-in. Use wizard for custom generation.')}", _YLW))
+        print(f"  {L('已内置详细配置的预设','Fully built presets')}: {_BUILT_PRESET_NAMES}")
+        print(f"  {L('全部预设名称','All preset names')}: {_ALL_PRESET_NAMES}")
         return
     content = assemble(preset)
     preview_and_save(content)
@@ -1173,21 +1330,24 @@ def cmd_presets():
     print(hdr(L("📦 可用预设模板", "📦 Available Presets")))
     for key in PRESET_FACTORIES:
         p = PRESET_FACTORIES[key](_LANG)
-        print(f"  {c(key, C.CYN + C.B):<24} {p['project_desc']}  {c('✅', C.GRN)}")
-    for key, (zh_desc, en_desc) in _SIMPLE_PRESET_META.items():
-        desc = zh_desc if _LANG == "zh" else en_desc
-        print(f"  {c(key, C.CYN + C.B):<24} {desc}  {c(L('(待完善)', '(coming)'), C.DIM)}")
-    print(f"\n  {L('使用方法','Usage')}: {c('python claudemd_generator.py quick <preset>', C.DIM)}")
-    print(f"  {L('英文输出','English')}: {c('python claudemd_generator.py quick <preset> --en', C.DIM)}")
+        print(f"  {c(key, _CYN + _B):<24} {p['project_desc']}  {c('✅', _GRN)}")
+    for key, descs in _SIMPLE_PRESET_META.items():
+        desc = descs[_L_INDEX]
+        print(f"  {c(key, _CYN + _B):<24} {desc}  {c(L('(待完善)', '(coming)'), _DIM)}")
+    print(f"\n  {L('使用方法','Usage')}: {c('python claudemd_generator.py quick <preset>', _DIM)}")
+    print(f"  {L('英文输出','English')}: {c('python claudemd_generator.py quick <preset> --en', _DIM)}")
 
 def cmd_example():
     print(hdr(L("📄 完整示例 (go-api)", "📄 Full Example (go-api)")))
-    content = assemble(_go_api_preset(_LANG))
-    print(content)
+    # 逐段写出，不拼接完整文档
+    for i, part in enumerate(assemble_iter(_get_preset("go-api"))):
+        sys.stdout.write(f"\n{part}" if i else part)
+    sys.stdout.write("\n")
 
 def cmd_help():
     print(__doc__)
 
+
 # ============================================================================
 # 主入口
 # ============================================================================
@@ -1202,7 +1362,7 @@ def print_banner():
     ║                                                       ║
     ╚═══════════════════════════════════════════════════════╝
     """
-    print(c(banner, C.CYN))
+    print(c(banner, _CYN))
 
 def main():
     # 解析全局 --en 参数
@@ -1212,12 +1372,12 @@ def main():
 
     if len(sys.argv) <= 1:
         print_banner()
-        print(f"  {c('[1]', C.CYN)} 🧙 {L('交互式向导（按角色引导）','Interactive Wizard (role-aware)')}")
-        print(f"  {c('[2]', C.CYN)} ⚡ {L('快速预设生成','Quick Preset')}")
-        print(f"  {c('[3]', C.CYN)} 📦 {L('查看所有预设','List Presets')}")
-        print(f"  {c('[4]', C.CYN)} 📄 {L('查看完整示例','Full Example')}")
-        print(f"  {c('[h]', C.CYN)} {L('帮助','Help')}")
-        print(f"  {c('[q]', C.CYN)} {L('退出','Quit')}")
+        print(f"  {c('[1]', _CYN)} 🧙 {L('交互式向导（按角色引导）','Interactive Wizard (role-aware)')}")
+        print(f"  {c('[2]', _CYN)} ⚡ {L('快速预设生成','Quick Preset')}")
+        print(f"  {c('[3]', _CYN)} 📦 {L('查看所有预设','List Presets')}")
+        print(f"  {c('[4]', _CYN)} 📄 {L('查看完整示例','Full Example')}")
+        print(f"  {c('[h]', _CYN)} {L('帮助','Help')}")
+        print(f"  {c('[q]', _CYN)} {L('退出','Quit')}")
 
         choice = input(f"\n  {L('请选择','Choose')}: ").strip().lower()
         if choice == "1":
@@ -1235,7 +1395,7 @@ def main():
         elif choice in ("h", "help"):
             cmd_help()
         elif choice in ("q", "quit", "exit"):
-            print(c(f"\n  👋 {L('再见！','Bye!')}", C.GRN))
+            print(c(f"\n  👋 {L('再见！','Bye!')}", _GRN))
         return
 
     command = sys.argv[1].lower()
@@ -1253,7 +1413,7 @@ def main():
     elif command in ("help", "h", "-h", "--help"):
         cmd_help()
     else:
-        print(c(f"  {L('未知命令','Unknown command')}: {command}", C.RED))
+        print(c(f"  {L('未知命令','Unknown command')}: {command}", _RED))
         cmd_help()
 
 